@@ -1,6 +1,9 @@
 import os
+import logging
 import secrets
+import time
 from flask import Flask
+from application.data_loader import DATA_SOURCES
 
 def create_app():
     """
@@ -9,7 +12,11 @@ def create_app():
     Returns:
         Flask application instance
     """
+    start = time.perf_counter()
     app = Flask(__name__)
+    if app.logger.level == logging.NOTSET:
+        # Make the startup and warm-up timings visible outside debug mode
+        app.logger.setLevel(logging.INFO)
 
     # Configure the app
     app.config['SECRET_KEY'] = os.getenv('SECRET_KEY')
@@ -28,12 +35,30 @@ def create_app():
     app.config['SESSION_TYPE'] = 'filesystem'
     app.config['PERMANENT_SESSION_LIFETIME'] = 3600  # Session lifetime in seconds (1 hour)
 
+    # Configure the data source: the built-in dummy data or the extracted MovieLens CSVs
+    app.config['DATA_SOURCE'] = os.getenv('DATA_SOURCE', 'dummy').lower()
+    if app.config['DATA_SOURCE'] not in DATA_SOURCES:
+        raise ValueError(f"Invalid DATA_SOURCE '{app.config['DATA_SOURCE']}', expected one of {', '.join(DATA_SOURCES)}")
+
+    # Configure warm-up: background, preload or off (see application/warmup.py)
+    app.config['WARMUP_MODE'] = os.getenv('WARMUP_MODE', 'background').lower()
+
     # Register blueprints
     from application.routes import main as main_blueprint
     app.register_blueprint(main_blueprint)
 
+    # Serve static files with fingerprinted URLs and precompressed variants
+    from application import static_assets
+    static_assets.init_app(app)
+
     @app.route('/test')
     def test_page():
         return "<h1>Test Page</h1>"
 
+    app.logger.info(f"App created in {time.perf_counter() - start:.3f}s")
+
+    # Load data and model (in the background unless preloading)
+    from application.warmup import start_warmup
+    start_warmup(app)
+
     return app
\ No newline at end of file
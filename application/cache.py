@@ -0,0 +1,176 @@
+"""
+Render Cache Module
+
+This module caches rendered pages and template fragments in process memory and
+adds strong ETags to responses so that browsers can revalidate with a cheap
+304 Not Modified instead of downloading the page again.
+
+Cache keys combine the route arguments with a data version, so cached output
+is dropped automatically when the extracted data changes. Fragments that show
+model output also include the model version, set by warm-up when the model is
+loaded. Caching is disabled in debug mode so that template edits show up
+immediately.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from functools import wraps
+from flask import current_app, make_response, request, session
+from markupsafe import Markup
+
+from application.data_loader import DATA_DIR
+
+# Maximum number of pages and fragments kept in memory
+MAX_ENTRIES = 512
+
+# Written by scripts/setup_data.py; holds the hashes of the extracted archives
+SETUP_MANIFEST_FILE = DATA_DIR / '.setup_manifest.json'
+
+class RenderCache:
+    """A thread-safe, size-bounded LRU cache for rendered output."""
+
+    def __init__(self, max_entries=MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return the cached value for key, or None."""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        """Store value under key, evicting the least recently used entry if full."""
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Remove every entry."""
+        with self._lock:
+            self._entries.clear()
+
+render_cache = RenderCache()
+
+_data_version = None
+_model_version = 'none'
+
+def data_version():
+    """
+    Return a short version string for the data the pages are rendered from.
+
+    The data is loaded once per process, so the version is computed once too.
+    """
+    global _data_version
+    if _data_version is None:
+        try:
+            _data_version = hashlib.sha256(SETUP_MANIFEST_FILE.read_bytes()).hexdigest()[:16]
+        except OSError:
+            _data_version = 'none'
+    return _data_version
+
+def model_version():
+    """Return the version of the loaded recommendation model."""
+    return _model_version
+
+def set_model_version(version):
+    """Record the version of a newly loaded recommendation model."""
+    global _model_version
+    _model_version = version
+
+def make_key(*parts):
+    """Build a cache key from the data version and the given parts."""
+    return hashlib.sha256(repr((data_version(),) + parts).encode('utf-8')).hexdigest()
+
+def etag_for(body):
+    """Return a strong ETag value for a rendered body."""
+    return hashlib.sha256(body.encode('utf-8')).hexdigest()[:32]
+
+def conditional_response(body, etag=None, private=False):
+    """
+    Build a response for body with a strong ETag, answering 304 if it matches.
+
+    Args:
+        body: Rendered HTML
+        etag: Precomputed ETag for body, computed if not given
+        private: Whether the page is specific to the logged-in user
+
+    Returns:
+        Flask response object
+    """
+    response = make_response(body)
+    response.set_etag(etag or etag_for(body))
+    response.headers['Cache-Control'] = 'private, no-cache' if private else 'public, no-cache'
+    response.vary.add('Cookie')
+    return response.make_conditional(request)
+
+def _is_anonymous():
+    """Return True if the page cannot depend on the session."""
+    return 'user' not in session and '_flashes' not in session
+
+def cached_page(**key_args):
+    """
+    Cache the page rendered by the decorated view for anonymous visitors.
+
+    The cache key is the endpoint, the view's query arguments and the data
+    version. Only the arguments named in key_args are used, each parsed the way
+    the view reads it, so unknown or malformed arguments share the cache entry
+    of the page they render.
+
+    Every response gets a strong ETag; pages for logged-in users (or with
+    pending flash messages) are rendered normally and not stored.
+
+    Args:
+        key_args: Query argument name -> (default, type) as passed to request.args.get
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if current_app.debug or not _is_anonymous():
+                body = view(*args, **kwargs)
+                if not isinstance(body, str):
+                    return body
+                return conditional_response(body, private='user' in session)
+
+            query = tuple((name, request.args.get(name, default, type=type_))
+                          for name, (default, type_) in sorted(key_args.items()))
+            key = make_key('page', request.endpoint, tuple(sorted(kwargs.items())), query)
+            entry = render_cache.get(key)
+            if entry is None:
+                body = view(*args, **kwargs)
+                if not isinstance(body, str):
+                    return body
+                entry = (body, etag_for(body))
+                render_cache.set(key, entry)
+            return conditional_response(*entry)
+
+        return wrapper
+
+    return decorator
+
+def cached_fragment(key_parts, render):
+    """
+    Return a rendered template fragment, rendering it only on a cache miss.
+
+    Args:
+        key_parts: Tuple identifying the fragment and everything it depends on
+        render: Callable returning the rendered fragment
+
+    Returns:
+        The fragment as Markup, safe to insert into a template
+    """
+    if current_app.debug:
+        return Markup(render())
+
+    key = make_key('fragment', *key_parts)
+    fragment = render_cache.get(key)
+    if fragment is None:
+        fragment = Markup(render())
+        render_cache.set(key, fragment)
+    return fragment
@@ -2,10 +2,16 @@
 Data Loader Module
 
 This module provides functions to load and process data from the CSV files.
+
+pandas is imported inside the loaders rather than at module level so that
+importing the application does not pay for it; the loaded DataFrames are
+cached for the life of the process (see application/warmup.py) and shared
+between callers, so treat them as read-only.
 """
 
 import os
-import pandas as pd
+import threading
+from functools import wraps
 from pathlib import Path
 
 # Define paths
@@ -14,6 +20,9 @@ DATA_DIR = BASE_DIR / 'data'
 ML_DATA_DIR = DATA_DIR / 'ml-latest-small'
 TMDB_DATA_DIR = DATA_DIR / 'tmdb_metadata'
 
+# Data sources selectable with the DATA_SOURCE setting
+DATA_SOURCES = ('dummy', 'movielens')
+
 # Data file paths
 MOVIES_FILE = ML_DATA_DIR / 'movies.csv'
 RATINGS_FILE = ML_DATA_DIR / 'ratings.csv'
@@ -22,6 +31,27 @@ TAGS_FILE = ML_DATA_DIR / 'tags.csv'
 POSTER_LINKS_FILE = TMDB_DATA_DIR / 'poster_links.csv'
 CAST_CREW_FILE = TMDB_DATA_DIR / 'movie_cast_and_crew.csv'
 
+def _load_once(loader):
+    """
+    Cache the result of a loader that takes no arguments.
+
+    Concurrent first calls (e.g. a request arriving during warm-up) wait for a
+    single load instead of each running their own.
+    """
+    lock = threading.Lock()
+    result = []
+
+    @wraps(loader)
+    def wrapper():
+        if not result:
+            with lock:
+                if not result:
+                    result.append(loader())
+        return result[0]
+
+    wrapper.cache_clear = result.clear
+    return wrapper
+
 def check_data_files():
     """Check if all required data files exist."""
     required_files = [
@@ -44,9 +74,11 @@ def check_data_files():
     
     return True
 
+@_load_once
 def load_movies():
     """Load and process the movies data."""
     check_data_files()
+    import pandas as pd
     
     # Load movies
     movies_df = pd.read_csv(MOVIES_FILE)
@@ -62,27 +94,33 @@ def load_movies():
     
     return movies_df
 
+@_load_once
 def load_ratings():
     """Load and process the ratings data."""
     check_data_files()
+    import pandas as pd
     
     # Load ratings
     ratings_df = pd.read_csv(RATINGS_FILE)
     
     return ratings_df
 
+@_load_once
 def load_poster_links():
     """Load and process the poster links data."""
     check_data_files()
+    import pandas as pd
     
     # Load poster links
     poster_links_df = pd.read_csv(POSTER_LINKS_FILE)
     
     return poster_links_df
 
+@_load_once
 def load_cast_and_crew():
     """Load and process the cast and crew data."""
     check_data_files()
+    import pandas as pd
     
     # Load cast and crew data
     cast_crew_df = pd.read_csv(CAST_CREW_FILE)
@@ -108,28 +146,139 @@ def get_movie_metadata(movie_id):
     
     return movie_data
 
+class UserRatingsIndex:
+    """
+    Ratings joined with movie details and sorted by (userId, timestamp).
+
+    Each user's ratings form one contiguous block of rows, located with a
+    lookup table of row offsets. The orders for the other sort options are
+    built once, grouped by user in the same way, so every sort reads a page as
+    a slice and costs the same however many ratings the user has.
+    """
+
+    # Sort options: name -> (column, ascending)
+    SORT_OPTIONS = {
+        'date': ('timestamp', False),
+        'date-old': ('timestamp', True),
+        'rating-high': ('rating', False),
+        'rating-low': ('rating', True),
+        'title': ('title_key', True)
+    }
+    DATE_FORMAT = '%b %d, %Y'
+
+    def __init__(self, ratings_df, movies_df):
+        """
+        Build the index.
+
+        Args:
+            ratings_df: DataFrame with userId, movieId, rating and timestamp columns
+            movies_df: DataFrame with movieId, title, year and genres columns
+        """
+        import numpy as np
+
+        df = ratings_df.merge(movies_df[['movieId', 'title', 'year', 'genres']], on='movieId', how='inner')
+        df = df.sort_values(['userId', 'timestamp'], kind='stable').reset_index(drop=True)
+        df['title_key'] = df['title'].str.lower()
+
+        user_ids, starts = np.unique(df['userId'].to_numpy(), return_index=True)
+        stops = np.append(starts[1:], len(df))
+        self._offsets = dict(zip(user_ids.tolist(), zip(starts.tolist(), stops.tolist())))
+        self._df = df
+
+        # Row orders for the non-date sorts: by user, then the sort key, with
+        # ties newest first. The date sorts are the rows themselves.
+        user_keys = df['userId'].to_numpy()
+        self._rows = np.arange(len(df))
+        newest_first = -self._rows
+        self._orders = {}
+        for sort, (column, ascending) in self.SORT_OPTIONS.items():
+            if column == 'timestamp':
+                continue
+            keys = df[column].to_numpy()
+            if not ascending:
+                keys = -keys
+            self._orders[sort] = np.lexsort((newest_first, keys, user_keys))
+
+    def count(self, user_id):
+        """Return the number of ratings for a user."""
+        start, stop = self._offsets.get(user_id, (0, 0))
+        return stop - start
+
+    def _ordered_rows(self, user_id, sort):
+        """Return the row numbers of a user's ratings in the requested order."""
+        if sort not in self.SORT_OPTIONS:
+            raise ValueError(f"Invalid sort '{sort}', expected one of {', '.join(self.SORT_OPTIONS)}")
+        start, stop = self._offsets.get(user_id, (0, 0))
+        column, ascending = self.SORT_OPTIONS[sort]
+
+        if column == 'timestamp':
+            rows = self._rows[start:stop]
+            return rows if ascending else rows[::-1]
+        return self._orders[sort][start:stop]
+
+    def _to_records(self, rows):
+        """Convert index rows to the dicts used by the templates."""
+        import pandas as pd
+
+        chunk = self._df.iloc[rows]
+        dates = pd.to_datetime(chunk['timestamp'], unit='s', utc=True).dt.strftime(self.DATE_FORMAT)
+        years = chunk['year'].astype(object).where(chunk['year'].notna(), None)
+        return [
+            {
+                'user_id': str(user_id),
+                'movie_id': str(movie_id),
+                'movie_title': title,
+                'movie_year': year,
+                'movie_genres': genres,
+                'rating': rating,
+                'timestamp': timestamp,
+                'date_rated': date
+            }
+            for user_id, movie_id, title, year, genres, rating, timestamp, date in zip(
+                chunk['userId'].tolist(), chunk['movieId'].tolist(), chunk['title'].tolist(),
+                years.tolist(), chunk['genres'].tolist(), chunk['rating'].tolist(),
+                chunk['timestamp'].tolist(), dates.tolist()
+            )
+        ]
+
+    def version(self, user_id):
+        """Return a value that changes whenever the user's ratings change."""
+        start, stop = self._offsets.get(user_id, (0, 0))
+        if start == stop:
+            return (0, None)
+        return (stop - start, int(self._df['timestamp'].iat[stop - 1]))
+
+    def page(self, user_id, page=1, per_page=50, sort='date'):
+        """
+        Return one page of a user's ratings.
+
+        Args:
+            user_id: User ID
+            page: 1-based page number
+            per_page: Number of ratings per page
+            sort: One of SORT_OPTIONS
+
+        Returns:
+            List of rating dicts
+        """
+        rows = self._ordered_rows(user_id, sort)
+        offset = (page - 1) * per_page
+        return self._to_records(rows[offset:offset + per_page])
+
+    def iter_ratings(self, user_id, sort='date', chunk_size=500):
+        """Yield all of a user's ratings, formatting them chunk_size at a time."""
+        rows = self._ordered_rows(user_id, sort)
+        for offset in range(0, len(rows), chunk_size):
+            yield from self._to_records(rows[offset:offset + chunk_size])
+
+@_load_once
+def load_user_ratings_index():
+    """Load the per-user ratings index."""
+    return UserRatingsIndex(load_ratings(), load_movies())
+
 def get_user_ratings(user_id):
-    """Get all ratings for a specific user."""
-    # Load ratings
-    ratings_df = load_ratings()
-    
-    # Filter for the specific user
-    user_ratings = ratings_df[ratings_df['userId'] == user_id]
-    
-    # Get movie details for each rating
-    result = []
-    for _, rating in user_ratings.iterrows():
-        movie_data = get_movie_metadata(rating['movieId'])
-        if movie_data:
-            result.append({
-                'user_id': str(rating['userId']),
-                'movie_id': str(rating['movieId']),
-                'movie_title': movie_data['title'],
-                'rating': rating['rating'],
-                'timestamp': rating['timestamp']
-            })
-    
-    return result
+    """Get all ratings for a specific user, oldest first."""
+    return list(load_user_ratings_index().iter_ratings(user_id, sort='date-old'))
 
 def get_movie_recommendations(user_id, n=10):
     """
@@ -142,6 +291,7 @@ def get_movie_recommendations(user_id, n=10):
     # For now, just return some random movies
     # This will be replaced by the SVD model later
     import random
+    import pandas as pd
     random_movies = movies_df.sample(n)
     
     # Format the results
@@ -151,6 +301,8 @@ def get_movie_recommendations(user_id, n=10):
             'user_id': str(user_id),
             'movie_id': str(movie['movieId']),
             'movie_title': movie['title'],
+            'movie_year': movie['year'] if pd.notna(movie['year']) else None,
+            'movie_genres': movie['genres'],
             'est_rating': round(random.uniform(3.5, 5.0), 2)
         })
     
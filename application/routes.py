@@ -1,5 +1,11 @@
-from flask import Blueprint, render_template, redirect, url_for, request, flash, session
+from flask import (Blueprint, render_template, redirect, url_for, request, flash, session, jsonify,
+                   Response, stream_template, current_app)
 from datetime import datetime, UTC
+from math import ceil
+from application import warmup
+from application.data_loader import (UserRatingsIndex, load_user_ratings_index, get_movie_recommendations,
+                                     _load_once)
+from application.cache import cached_page, cached_fragment, conditional_response, model_version
 
 # Create a Blueprint for the main routes
 main = Blueprint('main', __name__)
@@ -100,12 +106,57 @@ movie_info = {
 # END OF TEMPORARY DUMMY DATA
 # =====================================================================
 
+# Number of ratings shown per page on /reviews
+REVIEWS_PER_PAGE = 50
+
+# User ID of the demo login for each DATA_SOURCE. MovieLens user 1 rated the
+# movies in the dummy ratings above.
+DEMO_USER_IDS = {
+    'dummy': '1132304',
+    'movielens': '1'
+}
+
+@_load_once
+def _dummy_ratings_index():
+    """Build a ratings index from the dummy data."""
+    import pandas as pd
+
+    ratings_df = pd.DataFrame([
+        {'userId': int(r['user_id']), 'movieId': int(r['movie_id']), 'rating': r['rating'], 'timestamp': r['timestamp']}
+        for r in ratings_
+    ])
+    movies_df = pd.DataFrame([
+        {
+            'movieId': int(r['movie_id']),
+            'title': r['movie_title'],
+            'year': str(movie_info[r['movie_id']]['year']) if r['movie_id'] in movie_info else None,
+            'genres': movie_info.get(r['movie_id'], {}).get('genres', [])
+        }
+        for r in ratings_
+    ]).drop_duplicates('movieId')
+    return UserRatingsIndex(ratings_df, movies_df)
+
+def _user_ratings_index():
+    """Return the ratings index for the configured DATA_SOURCE."""
+    if current_app.config['DATA_SOURCE'] == 'movielens':
+        return load_user_ratings_index()
+    return _dummy_ratings_index()
+
+@main.app_template_filter('csv_field')
+def csv_field(value):
+    """Quote a value for a CSV field if needed."""
+    value = '' if value is None else str(value)
+    if any(c in value for c in ',"\r\n'):
+        value = '"' + value.replace('"', '""') + '"'
+    return value
+
 @main.route('/')
 def index():
     """Homepage route"""
     return render_template('index.html', title='Home')
 
 @main.route('/catalog')
+@cached_page(page=(1, int), genre=(None, str), search=(None, str))
 def catalog():
     """Movie catalog route"""
     # Get query parameters for filtering and pagination
@@ -169,7 +220,7 @@ def login():
         if email == "user@example.com" and password == "password":
             # Set user in session
             session['user'] = {
-                'user_id': '1132304',  # Using the same user_id as in our dummy data
+                'user_id': DEMO_USER_IDS[current_app.config['DATA_SOURCE']],
                 'name': 'John',
                 'email': email
             }
@@ -198,24 +249,55 @@ def reviews():
     # Get user_id from session
     user_id = session['user']['user_id']
     
-    # TODO: Replace with SQLite database queries in Phase 4
-    # Filter ratings for the logged-in user
-    user_ratings = [r for r in ratings_ if r['user_id'] == user_id]
+    # Get query parameters for sorting and pagination
+    page = request.args.get('page', 1, type=int)
+    sort = request.args.get('sort', 'date')
+    if sort not in UserRatingsIndex.SORT_OPTIONS:
+        sort = 'date'
     
-    # Convert timestamp to datetime for display
-    for rating in user_ratings:
-        rating['date_rated'] = datetime.fromtimestamp(rating['timestamp'], UTC)
-        
-        # Add additional movie info for display purposes
-        movie_id = rating['movie_id']
-        if movie_id in movie_info:
-            rating['movie_year'] = movie_info[movie_id]['year']
-            rating['movie_genres'] = movie_info[movie_id]['genres']
+    # Only the requested page is read from the index and formatted
+    ratings_index = _user_ratings_index()
+    total_ratings = ratings_index.count(int(user_id))
+    total_pages = max(1, ceil(total_ratings / REVIEWS_PER_PAGE))
+    page = min(max(page, 1), total_pages)
+    user_ratings = ratings_index.page(int(user_id), page, REVIEWS_PER_PAGE, sort)
+    
+    # Pagination data
+    pagination = {
+        'current_page': page,
+        'total_pages': total_pages,
+        'has_prev': page > 1,
+        'has_next': page < total_pages,
+        'first_item': (page - 1) * REVIEWS_PER_PAGE + 1,
+        'last_item': (page - 1) * REVIEWS_PER_PAGE + len(user_ratings)
+    }
     
     return render_template('reviews.html', 
                           title='My Ratings',
                           ratings=user_ratings,
-                          total_ratings=len(user_ratings))
+                          total_ratings=total_ratings,
+                          pagination=pagination,
+                          sort=sort)
+
+@main.route('/reviews/export')
+def reviews_export():
+    """Export all of the user's ratings as CSV, streamed as it is rendered"""
+    # Check if user is logged in
+    if 'user' not in session:
+        flash('Please login to export your ratings.', 'warning')
+        return redirect(url_for('main.login'))
+    
+    # Get user_id from session
+    user_id = session['user']['user_id']
+    
+    sort = request.args.get('sort', 'date')
+    if sort not in UserRatingsIndex.SORT_OPTIONS:
+        sort = 'date'
+    
+    ratings = _user_ratings_index().iter_ratings(int(user_id), sort)
+    return Response(stream_template('reviews_export.csv', ratings=ratings),
+                    mimetype='text/csv',
+                    headers={'Content-Disposition': 'attachment; filename=my_ratings.csv'})
 
 @main.route('/recommend')
 def recommend():
@@ -228,29 +310,45 @@ def recommend():
     # Get user_id from session
     user_id = session['user']['user_id']
     
-    # TODO: Replace with SQLite database queries and SVD model in Phase 7
-    # Filter recommendations for the logged-in user
-    user_recommendations = [p for p in preds_ if p['user_id'] == user_id]
-    
-    # Prepare data for the template
-    personalized_recommendations = []
-    for rec in user_recommendations:
-        movie_id = rec['movie_id']
-        recommendation = {
-            'movie_id': movie_id,
-            'movie_title': rec['movie_title'],
-            'match_percentage': int(rec['est_rating'] * 20)  # Convert 5-star rating to percentage
-        }
-        
-        # Add additional movie info for display purposes
-        if movie_id in movie_info:
-            recommendation['movie_year'] = movie_info[movie_id]['year'] if movie_id in movie_info else 1995
-            recommendation['movie_genres'] = movie_info[movie_id]['genres'] if movie_id in movie_info else []
-        
-        # Add a description (this would come from a separate dataset in a real app)
-        recommendation['description'] = f"Recommended based on your ratings. Estimated rating: {rec['est_rating']}/5."
+    # The cards only change when the user's ratings (or the model) do
+    ratings_version = _user_ratings_index().version(int(user_id))
+
+    def render_personalized_cards():
+        # TODO: Replace with the SVD model in Phase 7
+        if current_app.config['DATA_SOURCE'] == 'movielens':
+            user_recommendations = get_movie_recommendations(int(user_id))
+        else:
+            # Filter recommendations for the logged-in user
+            user_recommendations = [p for p in preds_ if p['user_id'] == user_id]
         
-        personalized_recommendations.append(recommendation)
+        # Prepare data for the template
+        personalized_recommendations = []
+        for rec in user_recommendations:
+            movie_id = rec['movie_id']
+            recommendation = {
+                'movie_id': movie_id,
+                'movie_title': rec['movie_title'],
+                'match_percentage': int(rec['est_rating'] * 20)  # Convert 5-star rating to percentage
+            }
+            
+            # Add additional movie info for display purposes
+            if current_app.config['DATA_SOURCE'] == 'movielens':
+                recommendation['movie_year'] = rec['movie_year']
+                recommendation['movie_genres'] = rec['movie_genres']
+            elif movie_id in movie_info:
+                recommendation['movie_year'] = movie_info[movie_id]['year']
+                recommendation['movie_genres'] = movie_info[movie_id]['genres']
+            
+            # Add a description (this would come from a separate dataset in a real app)
+            recommendation['description'] = f"Recommended based on your ratings. Estimated rating: {rec['est_rating']}/5."
+            
+            personalized_recommendations.append(recommendation)
+
+        return render_template('includes/recommendation_cards.html',
+                               personalized=personalized_recommendations)
+
+    personalized_cards = cached_fragment(('recommendation_cards', user_id, ratings_version, model_version()),
+                                         render_personalized_cards)
     
     # Dummy popular recommendations
     popular_recommendations = [
@@ -264,10 +362,17 @@ def recommend():
         }
     ]
     
-    return render_template('recommend.html', 
+    body = render_template('recommend.html', 
                           title='Your Recommendations',
-                          personalized=personalized_recommendations,
+                          personalized_cards=personalized_cards,
                           popular=popular_recommendations)
+    return conditional_response(body, private=True)
+
+@main.route('/healthz')
+def healthz():
+    """Readiness probe: 200 once warm-up has finished, 503 until then"""
+    status = warmup.get_status()
+    return jsonify(status), 200 if warmup.is_ready() else 503
 
 @main.errorhandler(404)
 def page_not_found(e):
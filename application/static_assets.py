@@ -0,0 +1,80 @@
+"""
+Static Assets Module
+
+This module serves static files with fingerprinted, long-lived URLs and
+precompressed variants.
+
+- url_for('static', filename=...) gets a ?v=<content hash> argument, so a
+  fingerprinted URL can be cached by browsers for a year: it changes whenever
+  the file does. URLs with an outdated or unknown fingerprint get the default
+  caching headers.
+- If an up-to-date .br or .gz file produced by scripts/compress_static.py sits
+  next to the requested file and the client accepts that encoding, it is sent
+  instead.
+"""
+
+import hashlib
+import mimetypes
+import os
+from flask import request, send_from_directory
+from werkzeug.security import safe_join
+
+# Cache-Control for fingerprinted URLs
+LONG_CACHE = 'public, max-age=31536000, immutable'
+
+# Precompressed variants in order of preference: (Accept-Encoding token, suffix)
+ENCODINGS = [('br', '.br'), ('gzip', '.gz')]
+
+def init_app(app):
+    """
+    Install the fingerprinting URL defaults and the static file view.
+
+    Args:
+        app: Flask application instance
+    """
+    fingerprints = {}
+
+    def fingerprint(filename):
+        """Return the content hash of a static file, keyed on its mtime."""
+        path = os.path.join(app.static_folder, filename)
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            return None
+        cached = fingerprints.get(filename)
+        if cached is None or cached[0] != mtime:
+            with open(path, 'rb') as f:
+                cached = (mtime, hashlib.sha256(f.read()).hexdigest()[:12])
+            fingerprints[filename] = cached
+        return cached[1]
+
+    @app.url_defaults
+    def add_fingerprint(endpoint, values):
+        if endpoint == 'static' and 'filename' in values and 'v' not in values:
+            version = fingerprint(values['filename'])
+            if version:
+                values['v'] = version
+
+    def static(filename):
+        accepted = request.accept_encodings
+        original = safe_join(app.static_folder, filename)
+        response = None
+        for encoding, suffix in ENCODINGS:
+            if original is None or not os.path.isfile(original) or not accepted[encoding]:
+                continue
+            compressed = original + suffix
+            # Ignore variants older than the file itself; they are stale
+            if os.path.isfile(compressed) and os.path.getmtime(compressed) >= os.path.getmtime(original):
+                mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+                response = send_from_directory(app.static_folder, filename + suffix, mimetype=mimetype)
+                response.headers['Content-Encoding'] = encoding
+                break
+        if response is None:
+            response = app.send_static_file(filename)
+
+        response.vary.add('Accept-Encoding')
+        if request.args.get('v') and request.args['v'] == fingerprint(filename):
+            response.headers['Cache-Control'] = LONG_CACHE
+        return response
+
+    app.view_functions['static'] = static
@@ -0,0 +1,202 @@
+"""
+Warm-up Module
+
+This module loads the data (and, later, the SVD model) that the application
+needs before it can serve real traffic, and tracks whether that has happened.
+
+Three modes are supported, selected with the WARMUP_MODE environment variable:
+
+- background: warm up in a daemon thread while the server is already
+  accepting requests. The thread is started by the first request each serving
+  process receives (typically the load balancer's /healthz probe), so it always
+  runs in the process that serves traffic, never in a pre-fork master or in the
+  Werkzeug reloader's watcher process. Failures are retried with exponential
+  backoff, and /healthz reports 503 until warm-up has succeeded.
+- preload: warm up synchronously inside create_app(). Run the app under a
+  pre-forking server with preloading enabled (e.g. `gunicorn --preload main:app`)
+  so the master process loads everything once and the workers share those
+  pages copy-on-write instead of each loading their own copy. If it fails,
+  each worker falls back to retrying in the background.
+- off: skip warm-up entirely; data is loaded lazily on first use.
+
+Only the MovieLens data source (DATA_SOURCE=movielens) reads the CSV files;
+with the default dummy data there is no data to load.
+"""
+
+import gc
+import os
+import threading
+import time
+
+WARMUP_MODES = ('background', 'preload', 'off')
+
+# Backoff between failed background warm-up attempts, in seconds
+RETRY_INITIAL_DELAY = 1
+RETRY_MAX_DELAY = 60
+
+_lock = threading.Lock()
+_ready = threading.Event()
+_state = {}
+_thread = None
+_thread_pid = None
+
+def _reset_state():
+    """Forget any previous warm-up, e.g. one inherited from a parent process."""
+    _ready.clear()
+    _state.update(status='pending', error=None, attempts=0, timings={})  # status: pending, warming, ready, failed
+
+_reset_state()
+
+def _import_libraries(app):
+    """Import the heavy data libraries that are deferred at startup."""
+    import numpy  # noqa: F401
+    import pandas  # noqa: F401
+
+def _load_data(app):
+    """Load the CSV data and build the indexes in the data_loader caches."""
+    if app.config['DATA_SOURCE'] != 'movielens':
+        return
+
+    from application import data_loader
+
+    data_loader.load_movies()
+    data_loader.load_ratings()
+    data_loader.load_poster_links()
+    data_loader.load_user_ratings_index()
+
+def _load_model(app):
+    """Load the recommendation model and record its version for the render cache."""
+    import hashlib
+    from application.cache import set_model_version
+
+    # TODO: Load the SVD model in Phase 7. Until then the dummy predictions
+    # (or, for MovieLens, data_loader's random placeholder) stand in for it.
+    if app.config['DATA_SOURCE'] == 'movielens':
+        set_model_version('placeholder')
+    else:
+        from application.routes import preds_
+        set_model_version(hashlib.sha256(repr(preds_).encode('utf-8')).hexdigest()[:16])
+
+# Warm-up steps, run in order. Each entry is (name, callable taking the app).
+WARMUP_STEPS = [
+    ('imports', _import_libraries),
+    ('data', _load_data),
+    ('model', _load_model),
+]
+
+def _error_code(e):
+    """Return the error code reported by /healthz for a warm-up failure."""
+    return 'data_missing' if isinstance(e, FileNotFoundError) else 'load_error'
+
+def warm_up(app):
+    """
+    Run every warm-up step once in the current thread and log a timing breakdown.
+
+    Args:
+        app: Flask application instance
+
+    Returns:
+        True if all steps succeeded, False otherwise
+    """
+    _state['status'] = 'warming'
+    _state['attempts'] += 1
+
+    timings = {}
+    start = time.perf_counter()
+    try:
+        for name, step in WARMUP_STEPS:
+            step_start = time.perf_counter()
+            step(app)
+            timings[name] = time.perf_counter() - step_start
+    except Exception as e:
+        # The details (which may include server paths) only go to the log
+        if isinstance(e, FileNotFoundError):
+            app.logger.error(f"Warm-up attempt {_state['attempts']} failed: {e}")
+        else:
+            app.logger.exception(f"Warm-up attempt {_state['attempts']} failed")
+        _state['status'] = 'failed'
+        _state['error'] = _error_code(e)
+        _state['timings'] = timings
+        return False
+
+    timings['total'] = time.perf_counter() - start
+    _state['timings'] = timings
+    _state['status'] = 'ready'
+    _state['error'] = None
+    _ready.set()
+
+    breakdown = ', '.join(f"{name}={seconds:.3f}s" for name, seconds in timings.items())
+    app.logger.info(f"Warm-up complete: {breakdown}")
+    return True
+
+def _warm_up_with_retries(app):
+    """Run warm-up until it succeeds, backing off exponentially between attempts."""
+    delay = RETRY_INITIAL_DELAY
+    while not warm_up(app):
+        app.logger.info(f"Retrying warm-up in {delay}s")
+        time.sleep(delay)
+        delay = min(delay * 2, RETRY_MAX_DELAY)
+
+def ensure_warmup(app):
+    """
+    Start the background warm-up in this process unless it is ready or running.
+
+    Called before every request, so it returns immediately once warm. A thread
+    started in another process (a parent that has since forked) does not count:
+    threads don't survive a fork, so the state it left behind is reset.
+
+    Args:
+        app: Flask application instance
+    """
+    global _thread, _thread_pid
+    if _ready.is_set():
+        return
+
+    with _lock:
+        pid = os.getpid()
+        if _thread is not None and _thread_pid == pid and _thread.is_alive():
+            return
+        if _thread_pid is not None and _thread_pid != pid:
+            _reset_state()
+        _thread = threading.Thread(target=_warm_up_with_retries, args=(app,), name='warmup', daemon=True)
+        _thread_pid = pid
+        _thread.start()
+
+def start_warmup(app):
+    """
+    Start warm-up according to the app's WARMUP_MODE setting.
+
+    Args:
+        app: Flask application instance
+    """
+    mode = app.config['WARMUP_MODE']
+    if mode not in WARMUP_MODES:
+        raise ValueError(f"Invalid WARMUP_MODE '{mode}', expected one of {', '.join(WARMUP_MODES)}")
+
+    if mode == 'off':
+        _state['status'] = 'ready'
+        _ready.set()
+        return
+
+    if mode == 'preload' and warm_up(app):
+        # Move everything loaded so far out of the collector's generations so
+        # that GC passes in forked workers don't touch (and copy) those pages
+        gc.freeze()
+
+    # Background mode, or a failed preload: warm up in each serving process
+    @app.before_request
+    def warm_up_before_request():
+        ensure_warmup(app)
+
+def is_ready():
+    """Return True once warm-up has completed successfully."""
+    return _ready.is_set()
+
+def get_status():
+    """Return a copy of the current warm-up status for reporting."""
+    return {
+        'status': _state['status'],
+        'error': _state['error'],
+        'attempts': _state['attempts'],
+        'timings': {name: round(seconds, 3) for name, seconds in _state['timings'].items()}
+    }
@@ -1,3 +1,6 @@
+import time
+_start = time.perf_counter()
+
 import os
 from dotenv import load_dotenv
 # Load environment variables from both .env and .flaskenv files
@@ -6,8 +9,13 @@ load_dotenv(".flaskenv")
 load_dotenv()
 
 from application import create_app
+_imported = time.perf_counter()
 
 app = create_app()
+app.logger.info(
+    f"Startup: imports={_imported - _start:.3f}s, "
+    f"create_app={time.perf_counter() - _imported:.3f}s"
+)
 
 if __name__ == "__main__":
     # Get port from environment variable or use default
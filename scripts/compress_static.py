@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Static Compression Script
+
+This script writes gzip (and, if the brotli package is installed, brotli)
+compressed copies of the text assets in application/static, so the app can
+serve them without compressing on every request. It should be run on deploy,
+after the static files have changed.
+"""
+
+import gzip
+import logging
+import os
+import tempfile
+from pathlib import Path
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger('compress_static')
+
+# Define paths
+BASE_DIR = Path(__file__).resolve().parent.parent
+STATIC_DIR = BASE_DIR / 'application' / 'static'
+COMPRESSIBLE_SUFFIXES = {'.css', '.js', '.svg', '.html', '.json', '.txt'}
+
+def compressors():
+    """Return the available (suffix, compress function) pairs."""
+    available = [('.gz', lambda data: gzip.compress(data, compresslevel=9, mtime=0))]
+    if brotli is not None:
+        available.append(('.br', lambda data: brotli.compress(data, quality=11)))
+    else:
+        logger.warning("brotli is not installed, only writing gzip files")
+    return available
+
+def write_atomic(target, data):
+    """Write data to target via a temporary file, so readers never see a partial file."""
+    fd, tmp_path = tempfile.mkstemp(prefix=f'.{target.name}-', suffix='.tmp', dir=target.parent)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, target)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+def compress_file(path, available):
+    """Write the compressed variants of path that are missing or out of date."""
+    written = 0
+    data = None
+    for suffix, compress in available:
+        target = path.with_name(path.name + suffix)
+        if target.exists() and target.stat().st_mtime >= path.stat().st_mtime:
+            continue
+        if data is None:
+            data = path.read_bytes()
+        compressed = compress(data)
+        if len(compressed) >= len(data):
+            # Not worth serving; make sure a stale variant isn't used instead
+            target.unlink(missing_ok=True)
+            continue
+        write_atomic(target, compressed)
+        written += 1
+    return written
+
+def main():
+    """Main function to compress all static text assets."""
+    logger.info(f"Compressing static files in {STATIC_DIR}")
+    available = compressors()
+
+    written = 0
+    for path in sorted(STATIC_DIR.rglob('*')):
+        if path.is_file() and path.suffix in COMPRESSIBLE_SUFFIXES:
+            written += compress_file(path, available)
+
+    logger.info(f"Wrote {written} compressed files")
+
+if __name__ == "__main__":
+    main()
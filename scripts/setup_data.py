@@ -3,13 +3,25 @@
 Data Setup Script
 
 This script extracts the data files from the ZIP archives in the data directory.
-It should be run once after cloning the repository.
+It should be run after cloning the repository and on every deploy.
+
+The SHA-256 of each archive is recorded in a manifest file, and archives whose
+hash has not changed since the last run are skipped, so re-running the script
+on an unchanged tree is a no-op. Changed archives are extracted concurrently
+into a new hidden directory (e.g. data/.ml-latest-small-<hash>-xxxx), and
+data/ml-latest-small is a symlink that is atomically switched to it, so a
+running app never sees a missing or half-extracted directory.
 """
 
 import os
+import json
+import hashlib
 import zipfile
 import logging
 import shutil
+import tempfile
+import argparse
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Configure logging
@@ -22,72 +34,183 @@ logger = logging.getLogger('setup_data')
 # Define paths
 BASE_DIR = Path(__file__).resolve().parent.parent
 DATA_DIR = BASE_DIR / 'data'
+MANIFEST_FILE = DATA_DIR / '.setup_manifest.json'
 ZIP_FILES = [
     'ml-latest-small.zip',
     'tmdb_metadata.zip'
 ]
 
+CHUNK_SIZE = 1024 * 1024
+
+def file_hash(path):
+    """Return the SHA-256 hex digest of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def load_manifest():
+    """Load the manifest from the previous run, or an empty one."""
+    try:
+        with open(MANIFEST_FILE) as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        return {'archives': {}}
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable manifest {MANIFEST_FILE}: {e}")
+        return {'archives': {}}
+    manifest.setdefault('archives', {})
+    return manifest
+
+def save_manifest(manifest):
+    """Write the manifest atomically."""
+    tmp_path = MANIFEST_FILE.with_suffix('.tmp')
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, MANIFEST_FILE)
+
 def extract_zip(zip_path, extract_to):
-    """Extract a ZIP file to the specified directory."""
+    """
+    Extract a ZIP file into extract_to, streaming each member to disk.
+
+    Members whose paths would escape extract_to are rejected.
+    """
+    root = Path(extract_to).resolve()
+    with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+        for member in zip_ref.infolist():
+            target = (root / member.filename).resolve()
+            if target != root and root not in target.parents:
+                raise ValueError(f"Unsafe path in {zip_path.name}: {member.filename}")
+            if member.is_dir():
+                target.mkdir(parents=True, exist_ok=True)
+                continue
+            target.parent.mkdir(parents=True, exist_ok=True)
+            with zip_ref.open(member) as src, open(target, 'wb') as dst:
+                shutil.copyfileobj(src, dst, CHUNK_SIZE)
+
+def remove_stale(dir_path):
+    """
+    Remove the hidden directories of dir_path that it no longer links to.
+
+    These are previous versions and leftovers of interrupted runs.
+    """
+    current = dir_path.resolve() if dir_path.is_symlink() else None
+    for path in DATA_DIR.glob(f'.{dir_path.name}-*'):
+        if current is not None and current.is_relative_to(path.resolve()):
+            continue
+        logger.info(f"Removing stale {path}")
+        if path.is_symlink() or path.is_file():
+            path.unlink()
+        else:
+            shutil.rmtree(path)
+
+def install_archive(zip_path, dir_path, digest):
+    """
+    Extract zip_path into a new version directory and point dir_path at it.
+
+    dir_path is a symlink, replaced with os.replace() so that readers see
+    either the old or the new tree and never a missing one. A dir_path that
+    is still a real directory (from before symlinks were used) is moved aside
+    first and restored if the switch fails.
+    """
+    version_dir = Path(tempfile.mkdtemp(prefix=f'.{dir_path.name}-{digest[:12]}-', dir=DATA_DIR))
+    link_path = version_dir.with_name(version_dir.name + '-link')
+    legacy_dir = None
     try:
-        # First try with Python's zipfile
-        with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-            zip_ref.extractall(extract_to)
+        extract_zip(zip_path, version_dir)
+
+        # Archives usually contain a single top-level directory named after
+        # the archive; otherwise the members themselves form the directory
+        new_dir = version_dir / dir_path.name
+        if not new_dir.is_dir():
+            new_dir = version_dir
+
+        os.symlink(os.path.relpath(new_dir, DATA_DIR), link_path)
+        if dir_path.is_dir() and not dir_path.is_symlink():
+            legacy_dir = version_dir.with_name(version_dir.name + '-legacy')
+            os.rename(dir_path, legacy_dir)
+        os.replace(link_path, dir_path)
+    except BaseException:
+        if legacy_dir is not None and legacy_dir.exists() and not dir_path.exists():
+            os.rename(legacy_dir, dir_path)
+        if link_path.is_symlink():
+            link_path.unlink()
+        shutil.rmtree(version_dir, ignore_errors=True)
+        raise
+
+    remove_stale(dir_path)
+
+def process_archive(zip_file, manifest, force=False):
+    """
+    Extract one archive if it changed since the last run.
+
+    Returns:
+        Tuple of (zip_file, new hash or None on failure, whether it was extracted)
+    """
+    zip_path = DATA_DIR / zip_file
+    dir_path = DATA_DIR / zip_file.replace('.zip', '')
+
+    try:
+        remove_stale(dir_path)
+        digest = file_hash(zip_path)
+        if not force and manifest['archives'].get(zip_file) == digest and dir_path.is_dir():
+            logger.info(f"Unchanged, skipping: {zip_file}")
+            return zip_file, digest, False
+
+        install_archive(zip_path, dir_path, digest)
         logger.info(f"Successfully extracted {zip_path}")
-        return True
-    except zipfile.BadZipFile:
-        # If that fails, try using the system's unzip command
-        logger.warning(f"Python zipfile failed for {zip_path}, trying system unzip...")
-        try:
-            import subprocess
-            result = subprocess.run(['unzip', '-o', str(zip_path), '-d', str(extract_to)], 
-                                   capture_output=True, text=True)
-            if result.returncode == 0:
-                logger.info(f"Successfully extracted {zip_path} using system unzip")
-                return True
-            else:
-                logger.error(f"System unzip failed: {result.stderr}")
-                return False
-        except Exception as e:
-            logger.error(f"Failed to extract {zip_path} using system unzip: {e}")
-            return False
+        return zip_file, digest, True
     except Exception as e:
         logger.error(f"Failed to extract {zip_path}: {e}")
-        return False
+        return zip_file, None, False
 
-def main():
+def main(force=False, workers=None):
     """Main function to extract all ZIP files."""
     logger.info("Starting data extraction process")
-    
+
     # Create data directory if it doesn't exist
     if not DATA_DIR.exists():
         logger.info(f"Creating data directory: {DATA_DIR}")
         DATA_DIR.mkdir(parents=True)
-    
-    # Extract each ZIP file
-    success_count = 0
+
+    manifest = load_manifest()
+
+    present = []
     for zip_file in ZIP_FILES:
-        zip_path = DATA_DIR / zip_file
-        if zip_path.exists():
-            # Remove existing directory if it exists (to ensure clean extraction)
-            dir_name = zip_file.replace('.zip', '')
-            dir_path = DATA_DIR / dir_name
-            if dir_path.exists() and dir_path.is_dir():
-                logger.info(f"Removing existing directory: {dir_path}")
-                shutil.rmtree(dir_path)
-            
-            if extract_zip(zip_path, DATA_DIR):
-                success_count += 1
+        if (DATA_DIR / zip_file).exists():
+            present.append(zip_file)
         else:
-            logger.warning(f"ZIP file not found: {zip_path}")
-    
+            logger.warning(f"ZIP file not found: {DATA_DIR / zip_file}")
+
+    # Hash and extract the archives concurrently
+    changed = set()
+    success_count = 0
+    if present:
+        with ThreadPoolExecutor(max_workers=workers or len(present)) as executor:
+            results = list(executor.map(lambda zip_file: process_archive(zip_file, manifest, force), present))
+        for zip_file, digest, extracted in results:
+            if digest is None:
+                manifest['archives'].pop(zip_file, None)
+                continue
+            manifest['archives'][zip_file] = digest
+            success_count += 1
+            if extracted:
+                changed.add(zip_file)
+
+    save_manifest(manifest)
+
     # Report results
     if success_count == len(ZIP_FILES):
-        logger.info("All data files extracted successfully")
+        logger.info(f"All data files up to date ({len(changed)} extracted, {success_count - len(changed)} unchanged)")
     else:
         logger.warning(f"Extracted {success_count}/{len(ZIP_FILES)} data files")
-    
+
     logger.info("Data setup complete")
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Extract the data files from their ZIP archives.")
+    parser.add_argument('--force', action='store_true', help="re-extract every archive even if unchanged")
+    parser.add_argument('--workers', type=int, default=None, help="number of archives to extract concurrently")
+    args = parser.parse_args()
+    main(force=args.force, workers=args.workers)
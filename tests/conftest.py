@@ -0,0 +1,35 @@
+import pytest
+
+from application import create_app, warmup
+from application.cache import render_cache
+
+@pytest.fixture
+def make_app(monkeypatch):
+    """Return a factory creating an app with the given environment settings."""
+    def _make_app(**env):
+        settings = {'SECRET_KEY': 'test', 'FLASK_DEBUG': '0', 'DATA_SOURCE': 'dummy', 'WARMUP_MODE': 'off'}
+        settings.update(env)
+        for name, value in settings.items():
+            monkeypatch.setenv(name, value)
+        app = create_app()
+        app.config['TESTING'] = True
+        return app
+
+    warmup._reset_state()
+    monkeypatch.setattr(warmup, '_thread', None)
+    monkeypatch.setattr(warmup, '_thread_pid', None)
+    render_cache.clear()
+    return _make_app
+
+@pytest.fixture
+def app(make_app):
+    return make_app()
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+@pytest.fixture
+def logged_in_client(client):
+    client.post('/login', data={'email': 'user@example.com', 'password': 'password'})
+    return client
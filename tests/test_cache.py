@@ -0,0 +1,86 @@
+import re
+
+from application import cache, warmup
+from application.cache import render_cache
+
+def test_page_has_strong_etag_and_answers_304(client):
+    response = client.get('/catalog')
+    etag = response.headers['ETag']
+    assert response.status_code == 200
+    assert not etag.startswith('W/')
+
+    response = client.get('/catalog', headers={'If-None-Match': etag})
+    assert response.status_code == 304
+    assert response.data == b''
+
+def test_catalog_cached_for_anonymous_visitors_only(app):
+    app.test_client().get('/catalog')
+    assert len(render_cache._entries) == 1
+
+    render_cache.clear()
+    logged_in_client = app.test_client()
+    logged_in_client.post('/login', data={'email': 'user@example.com', 'password': 'password'})
+    logged_in_client.get('/')  # Consume the login flash message
+    response = logged_in_client.get('/catalog')
+    assert response.status_code == 200
+    assert 'private' in response.headers['Cache-Control']
+    assert len(render_cache._entries) == 0
+
+def test_unread_and_malformed_arguments_share_cache_entry(client):
+    first = client.get('/catalog?genre=comedy')
+    client.get('/catalog?genre=comedy&utm_source=x&junk=1')
+    client.get('/catalog?genre=comedy&page=not-a-number')
+    client.get('/catalog?page=1&genre=comedy')
+
+    assert len(render_cache._entries) == 1
+    assert client.get('/catalog?genre=comedy&junk=2').headers['ETag'] == first.headers['ETag']
+
+def test_no_caching_in_debug_mode(app, client):
+    app.debug = True
+    client.get('/catalog')
+    assert len(render_cache._entries) == 0
+
+def test_recommendation_cards_depend_on_model_version(logged_in_client, monkeypatch):
+    first = logged_in_client.get('/recommend')
+    assert first.status_code == 200
+    assert 'private' in first.headers['Cache-Control']
+    assert len(render_cache._entries) == 1
+
+    logged_in_client.get('/recommend')
+    assert len(render_cache._entries) == 1
+
+    monkeypatch.setattr(cache, '_model_version', 'new-model')
+    logged_in_client.get('/recommend')
+    assert len(render_cache._entries) == 2
+
+def test_warmup_sets_model_version(make_app, monkeypatch):
+    monkeypatch.setattr(cache, '_model_version', 'none')
+    make_app(WARMUP_MODE='preload')
+    assert warmup.is_ready()
+    assert cache.model_version() != 'none'
+
+def test_fingerprinted_static_urls_cached_long(client):
+    page = client.get('/catalog').get_data(as_text=True)
+    url = re.search(r'href="(/static/css/main.css\?v=[0-9a-f]+)"', page).group(1)
+
+    response = client.get(url)
+    assert 'immutable' in response.headers['Cache-Control']
+
+def test_stale_fingerprint_not_cached_long(client):
+    response = client.get('/static/css/main.css?v=0123456789ab')
+    assert response.status_code == 200
+    assert 'immutable' not in response.headers.get('Cache-Control', '')
+
+def test_precompressed_variant_served(client, app, tmp_path, monkeypatch):
+    monkeypatch.setattr(app, 'static_folder', str(tmp_path))
+    (tmp_path / 'app.js').write_text('console.log(1);')
+    (tmp_path / 'app.js.gz').write_bytes(b'gzipped')
+
+    response = client.get('/static/app.js', headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert response.data == b'gzipped'
+    assert 'javascript' in response.headers['Content-Type']
+
+    response = client.get('/static/app.js')
+    assert 'Content-Encoding' not in response.headers
+    assert response.data == b'console.log(1);'
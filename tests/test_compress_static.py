@@ -0,0 +1,84 @@
+import gzip
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# Make the scripts directory importable
+sys.path.append(str(Path(__file__).resolve().parent.parent / 'scripts'))
+
+import compress_static
+
+CSS = b'body { margin: 0; }\n' * 50
+
+@pytest.fixture
+def static_dir(tmp_path, monkeypatch):
+    """Point compress_static at an empty static directory."""
+    monkeypatch.setattr(compress_static, 'STATIC_DIR', tmp_path)
+    return tmp_path
+
+def test_writes_gzip_variant(static_dir):
+    (static_dir / 'main.css').write_bytes(CSS)
+
+    compress_static.main()
+
+    assert gzip.decompress((static_dir / 'main.css.gz').read_bytes()) == CSS
+    assert [p.name for p in static_dir.iterdir() if p.name.endswith('.tmp')] == []
+
+def test_up_to_date_variant_is_skipped(static_dir):
+    source = static_dir / 'main.css'
+    source.write_bytes(CSS)
+    target = static_dir / 'main.css.gz'
+    target.write_bytes(b'existing')
+    os.utime(source, (1000, 1000))
+    os.utime(target, (2000, 2000))
+
+    assert compress_static.compress_file(source, compress_static.compressors()) == 0
+    assert target.read_bytes() == b'existing'
+
+def test_stale_variant_is_rewritten(static_dir):
+    source = static_dir / 'main.css'
+    source.write_bytes(CSS)
+    target = static_dir / 'main.css.gz'
+    target.write_bytes(b'stale')
+    os.utime(target, (1000, 1000))
+    os.utime(source, (2000, 2000))
+
+    assert compress_static.compress_file(source, compress_static.compressors()) == 1
+    assert gzip.decompress(target.read_bytes()) == CSS
+
+def test_variant_that_does_not_shrink_is_deleted(static_dir):
+    source = static_dir / 'tiny.js'
+    source.write_bytes(b'x')
+    target = static_dir / 'tiny.js.gz'
+    target.write_bytes(b'stale')
+    os.utime(target, (1000, 1000))
+    os.utime(source, (2000, 2000))
+
+    assert compress_static.compress_file(source, compress_static.compressors()) == 0
+    assert not target.exists()
+
+def test_gzip_only_without_brotli(static_dir, monkeypatch):
+    monkeypatch.setattr(compress_static, 'brotli', None)
+    (static_dir / 'main.css').write_bytes(CSS)
+
+    assert [suffix for suffix, _ in compress_static.compressors()] == ['.gz']
+    compress_static.main()
+
+    assert (static_dir / 'main.css.gz').exists()
+    assert not (static_dir / 'main.css.br').exists()
+
+def test_failed_write_leaves_previous_variant(static_dir, monkeypatch):
+    target = static_dir / 'main.css.gz'
+    target.write_bytes(b'previous')
+
+    def fail_replace(src, dst):
+        raise OSError("replace failed")
+
+    monkeypatch.setattr(compress_static.os, 'replace', fail_replace)
+    with pytest.raises(OSError):
+        compress_static.write_atomic(target, b'new')
+
+    assert target.read_bytes() == b'previous'
+    assert [p.name for p in static_dir.iterdir()] == ['main.css.gz']
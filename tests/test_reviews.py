@@ -0,0 +1,180 @@
+import threading
+
+import pandas as pd
+import pytest
+
+from application import data_loader
+from application.data_loader import UserRatingsIndex
+
+MOVIES = pd.DataFrame({
+    'movieId': [1, 2, 3, 4],
+    'title': ['banana', 'Apple', 'cherry', 'apple'],
+    'year': ['1995', '1996', None, '1998'],
+    'genres': [['Comedy'], ['Drama'], [], ['Drama']]
+})
+
+RATINGS = pd.DataFrame({
+    'userId': [7, 7, 7, 7, 8],
+    'movieId': [1, 2, 3, 4, 1],
+    'rating': [4.0, 5.0, 4.0, 2.5, 3.0],
+    'timestamp': [100, 300, 200, 400, 0]
+})
+
+@pytest.fixture
+def index():
+    return UserRatingsIndex(RATINGS, MOVIES)
+
+def titles(ratings):
+    return [r['movie_title'] for r in ratings]
+
+def test_sort_orders(index):
+    assert titles(index.page(7, sort='date')) == ['apple', 'Apple', 'cherry', 'banana']
+    assert titles(index.page(7, sort='date-old')) == ['banana', 'cherry', 'Apple', 'apple']
+    assert titles(index.page(7, sort='rating-low')) == ['apple', 'cherry', 'banana', 'Apple']
+
+def test_ties_are_newest_first(index):
+    # banana and cherry both have 4.0; cherry is newer
+    assert titles(index.page(7, sort='rating-high')) == ['Apple', 'cherry', 'banana', 'apple']
+    # Titles compare case-insensitively; 'apple' is newer than 'Apple'
+    assert titles(index.page(7, sort='title')) == ['apple', 'Apple', 'banana', 'cherry']
+
+def test_pagination(index):
+    assert index.count(7) == 4
+    assert titles(index.page(7, page=1, per_page=3)) == ['apple', 'Apple', 'cherry']
+    assert titles(index.page(7, page=2, per_page=3)) == ['banana']
+    assert index.page(7, page=3, per_page=3) == []
+    assert list(index.iter_ratings(7, chunk_size=3)) == index.page(7, per_page=10)
+
+def test_unknown_user(index):
+    assert index.count(99) == 0
+    assert index.page(99) == []
+    assert index.version(99) == (0, None)
+
+def test_invalid_sort(index):
+    with pytest.raises(ValueError):
+        index.page(7, sort='popularity')
+
+def test_record_fields(index):
+    rating = index.page(8)[0]
+    assert rating == {
+        'user_id': '8',
+        'movie_id': '1',
+        'movie_title': 'banana',
+        'movie_year': '1995',
+        'movie_genres': ['Comedy'],
+        'rating': 3.0,
+        'timestamp': 0,
+        'date_rated': 'Jan 01, 1970'
+    }
+    assert index.page(7, sort='date-old')[1]['movie_year'] is None
+
+def test_version_changes_with_ratings(index):
+    more = pd.concat([RATINGS, pd.DataFrame({'userId': [7], 'movieId': [1], 'rating': [1.0], 'timestamp': [500]})])
+    assert UserRatingsIndex(more, MOVIES).version(7) != index.version(7)
+
+def test_load_once_shares_concurrent_load():
+    calls = []
+    barrier = threading.Barrier(8)
+
+    @data_loader._load_once
+    def loader():
+        calls.append(1)
+        return object()
+
+    results = []
+
+    def worker():
+        barrier.wait()
+        results.append(loader())
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert len(set(map(id, results))) == 1
+
+def test_reviews_requires_login(client):
+    response = client.get('/reviews')
+    assert response.status_code == 302
+
+def test_reviews_with_dummy_data(logged_in_client):
+    page = logged_in_client.get('/reviews?sort=title').get_data(as_text=True)
+    assert 'You have rated <span class="fw-bold">3</span> movies.' in page
+    assert page.index('Dances with Wolves') < page.index('Independence Day') < page.index('Toy Story')
+
+def test_reviews_clamps_page_and_sort(logged_in_client):
+    response = logged_in_client.get('/reviews?page=99&sort=bogus')
+    assert response.status_code == 200
+    assert 'Toy Story' in response.get_data(as_text=True)
+
+def test_export_streams_csv(logged_in_client):
+    response = logged_in_client.get('/reviews/export?sort=title')
+    assert response.is_streamed
+    assert response.mimetype == 'text/csv'
+    lines = response.get_data(as_text=True).splitlines()
+    assert lines[0] == 'Title,Year,Genres,Rating,Date Rated'
+    assert lines[1] == 'Dances with Wolves,,,4.0,"Jul 30, 2000"'
+    assert len(lines) == 4
+
+@pytest.fixture
+def movielens_data(tmp_path, monkeypatch):
+    """Write a small MovieLens-style data set and point data_loader at it."""
+    files = {
+        'MOVIES_FILE': 'movies.csv',
+        'RATINGS_FILE': 'ratings.csv',
+        'LINKS_FILE': 'links.csv',
+        'TAGS_FILE': 'tags.csv',
+        'POSTER_LINKS_FILE': 'poster_links.csv',
+        'CAST_CREW_FILE': 'movie_cast_and_crew.csv'
+    }
+    for name, filename in files.items():
+        monkeypatch.setattr(data_loader, name, tmp_path / filename)
+        (tmp_path / filename).write_text('movieId\n1\n')
+
+    pd.DataFrame({
+        'movieId': range(1, 21),
+        'title': [f'Movie {i} (2000)' for i in range(1, 21)],
+        'genres': ['Drama'] * 20
+    }).to_csv(tmp_path / 'movies.csv', index=False)
+    pd.DataFrame({
+        'userId': [1] * 12 + [2],
+        'movieId': list(range(1, 13)) + [1],
+        'rating': [4.0] * 13,
+        'timestamp': range(13)
+    }).to_csv(tmp_path / 'ratings.csv', index=False)
+
+    loaders = [data_loader.load_movies, data_loader.load_ratings, data_loader.load_poster_links,
+               data_loader.load_cast_and_crew, data_loader.load_user_ratings_index]
+    for loader in loaders:
+        loader.cache_clear()
+    yield tmp_path
+    for loader in loaders:
+        loader.cache_clear()
+
+def test_movielens_source_uses_demo_user(make_app, movielens_data):
+    client = make_app(DATA_SOURCE='movielens').test_client()
+    client.post('/login', data={'email': 'user@example.com', 'password': 'password'})
+
+    page = client.get('/reviews').get_data(as_text=True)
+    assert 'You have rated <span class="fw-bold">12</span> movies.' in page
+    assert client.get('/recommend').status_code == 200
+
+def test_movielens_recommendations_show_movie_details(make_app, movielens_data):
+    client = make_app(DATA_SOURCE='movielens').test_client()
+    client.post('/login', data={'email': 'user@example.com', 'password': 'password'})
+    client.get('/')  # Consume the login flash message
+
+    page = client.get('/recommend').get_data(as_text=True)
+    assert page.count('| Drama') == 10
+    assert page.count('2000') >= 10
+
+def test_dummy_source_ignores_extracted_data(logged_in_client, movielens_data):
+    page = logged_in_client.get('/reviews').get_data(as_text=True)
+    assert 'You have rated <span class="fw-bold">3</span> movies.' in page
+
+def test_invalid_data_source(make_app):
+    with pytest.raises(ValueError):
+        make_app(DATA_SOURCE='netflix')
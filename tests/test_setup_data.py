@@ -0,0 +1,109 @@
+import sys
+import zipfile
+from pathlib import Path
+
+import pytest
+
+# Make the scripts directory importable
+sys.path.append(str(Path(__file__).resolve().parent.parent / 'scripts'))
+
+import setup_data
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    """Point setup_data at an empty data directory."""
+    monkeypatch.setattr(setup_data, 'DATA_DIR', tmp_path)
+    monkeypatch.setattr(setup_data, 'MANIFEST_FILE', tmp_path / '.setup_manifest.json')
+    monkeypatch.setattr(setup_data, 'ZIP_FILES', ['ml-latest-small.zip'])
+    return tmp_path
+
+def write_zip(path, members):
+    """Write a ZIP file with the given {name: content} members."""
+    with zipfile.ZipFile(path, 'w') as zip_ref:
+        for name, content in members.items():
+            zip_ref.writestr(name, content)
+
+def hidden_entries(data_dir):
+    return sorted(p.name for p in data_dir.glob('.ml-latest-small-*'))
+
+def test_extracts_into_symlinked_version(data_dir):
+    write_zip(data_dir / 'ml-latest-small.zip', {'ml-latest-small/movies.csv': 'v1'})
+
+    setup_data.main()
+
+    link = data_dir / 'ml-latest-small'
+    assert link.is_symlink()
+    assert (link / 'movies.csv').read_text() == 'v1'
+    assert len(hidden_entries(data_dir)) == 1
+
+def test_unchanged_archive_is_skipped(data_dir, monkeypatch):
+    write_zip(data_dir / 'ml-latest-small.zip', {'ml-latest-small/movies.csv': 'v1'})
+    setup_data.main()
+
+    def fail(*args):
+        raise AssertionError("unchanged archive was extracted again")
+
+    monkeypatch.setattr(setup_data, 'install_archive', fail)
+    setup_data.main()
+    assert (data_dir / 'ml-latest-small' / 'movies.csv').read_text() == 'v1'
+
+def test_changed_archive_replaces_previous_version(data_dir):
+    write_zip(data_dir / 'ml-latest-small.zip', {'ml-latest-small/movies.csv': 'v1'})
+    setup_data.main()
+    old_version = hidden_entries(data_dir)
+
+    write_zip(data_dir / 'ml-latest-small.zip', {'ml-latest-small/movies.csv': 'v2'})
+    setup_data.main()
+
+    assert (data_dir / 'ml-latest-small' / 'movies.csv').read_text() == 'v2'
+    assert len(hidden_entries(data_dir)) == 1
+    assert hidden_entries(data_dir) != old_version
+
+def test_unsafe_paths_are_rejected(data_dir):
+    write_zip(data_dir / 'ml-latest-small.zip', {'../evil.txt': 'x'})
+
+    setup_data.main()
+
+    assert not (data_dir.parent / 'evil.txt').exists()
+    assert not (data_dir / 'ml-latest-small').exists()
+    assert hidden_entries(data_dir) == []
+    assert 'ml-latest-small.zip' not in setup_data.load_manifest()['archives']
+
+def test_leftovers_of_interrupted_runs_are_removed(data_dir):
+    (data_dir / '.ml-latest-small-abc123-killed').mkdir()
+    (data_dir / '.ml-latest-small-abc123-killed' / 'partial.csv').write_text('x')
+    write_zip(data_dir / 'ml-latest-small.zip', {'ml-latest-small/movies.csv': 'v1'})
+
+    setup_data.main()
+
+    assert not (data_dir / '.ml-latest-small-abc123-killed').exists()
+    assert len(hidden_entries(data_dir)) == 1
+
+def test_legacy_directory_restored_when_switch_fails(data_dir, monkeypatch):
+    legacy = data_dir / 'ml-latest-small'
+    legacy.mkdir()
+    (legacy / 'movies.csv').write_text('old')
+    write_zip(data_dir / 'ml-latest-small.zip', {'ml-latest-small/movies.csv': 'new'})
+
+    def fail_replace(src, dst):
+        raise OSError("replace failed")
+
+    monkeypatch.setattr(setup_data.os, 'replace', fail_replace)
+    with pytest.raises(OSError):
+        setup_data.install_archive(data_dir / 'ml-latest-small.zip', legacy, 'f' * 64)
+
+    assert not legacy.is_symlink()
+    assert (legacy / 'movies.csv').read_text() == 'old'
+    assert hidden_entries(data_dir) == []
+
+def test_legacy_directory_is_migrated(data_dir):
+    legacy = data_dir / 'ml-latest-small'
+    legacy.mkdir()
+    (legacy / 'movies.csv').write_text('old')
+    write_zip(data_dir / 'ml-latest-small.zip', {'ml-latest-small/movies.csv': 'new'})
+
+    setup_data.main()
+
+    assert legacy.is_symlink()
+    assert (legacy / 'movies.csv').read_text() == 'new'
+    assert len(hidden_entries(data_dir)) == 1
@@ -0,0 +1,93 @@
+import time
+
+import pytest
+
+from application import warmup
+
+def wait_for(condition, timeout=5):
+    """Poll condition until it is true or the timeout expires."""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("Timed out waiting for condition")
+        time.sleep(0.01)
+
+@pytest.fixture
+def steps(monkeypatch):
+    """Replace the warm-up steps with one that fails until told to succeed."""
+    control = {'fail': None, 'calls': 0}
+
+    def step(app):
+        control['calls'] += 1
+        if control['fail'] is not None:
+            raise control['fail']
+
+    monkeypatch.setattr(warmup, 'WARMUP_STEPS', [('step', step)])
+    monkeypatch.setattr(warmup, 'RETRY_INITIAL_DELAY', 0.01)
+    return control
+
+def test_healthz_ready_when_warmup_off(client):
+    response = client.get('/healthz')
+    assert response.status_code == 200
+    assert response.json['status'] == 'ready'
+
+def test_background_warmup_starts_on_first_request(make_app, steps):
+    client = make_app(WARMUP_MODE='background').test_client()
+    assert steps['calls'] == 0
+
+    client.get('/healthz')
+    wait_for(warmup.is_ready)
+
+    response = client.get('/healthz')
+    assert response.status_code == 200
+    assert response.json['status'] == 'ready'
+    assert 'step' in response.json['timings']
+
+def test_failed_warmup_is_retried(make_app, steps, tmp_path):
+    steps['fail'] = FileNotFoundError(f"Missing required data files:\n{tmp_path}/movies.csv")
+    client = make_app(WARMUP_MODE='background').test_client()
+
+    client.get('/healthz')
+    wait_for(lambda: warmup.get_status()['attempts'] >= 2)
+    response = client.get('/healthz')
+    assert response.status_code == 503
+    assert response.json['error'] == 'data_missing'
+    assert str(tmp_path) not in response.get_data(as_text=True)
+
+    steps['fail'] = None
+    wait_for(warmup.is_ready)
+    response = client.get('/healthz')
+    assert response.status_code == 200
+    assert response.json['error'] is None
+
+def test_unexpected_errors_use_generic_code(make_app, steps):
+    steps['fail'] = RuntimeError("/secret/path exploded")
+    client = make_app(WARMUP_MODE='background').test_client()
+
+    client.get('/healthz')
+    wait_for(lambda: warmup.get_status()['status'] == 'failed')
+    response = client.get('/healthz')
+    assert response.json['error'] == 'load_error'
+    assert '/secret/path' not in response.get_data(as_text=True)
+    steps['fail'] = None
+    wait_for(warmup.is_ready)
+
+def test_preload_warms_up_before_first_request(make_app, steps):
+    make_app(WARMUP_MODE='preload')
+    assert warmup.is_ready()
+    assert steps['calls'] == 1
+
+def test_warmup_restarts_in_forked_process(make_app, steps, monkeypatch):
+    client = make_app(WARMUP_MODE='background').test_client()
+
+    # Simulate a worker forked while the parent's warm-up was in progress
+    warmup._state['status'] = 'warming'
+    monkeypatch.setattr(warmup, '_thread_pid', -1)
+
+    client.get('/healthz')
+    wait_for(warmup.is_ready)
+    assert warmup._thread_pid != -1
+
+def test_invalid_warmup_mode(make_app):
+    with pytest.raises(ValueError):
+        make_app(WARMUP_MODE='sometimes')